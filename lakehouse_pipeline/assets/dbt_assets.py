@@ -1,13 +1,51 @@
 from pathlib import Path
 
+import yaml
 from dagster import AssetExecutionContext
 from dagster_dbt import DbtCliResource, DbtProject, dbt_assets
 
 
+# dbt_project.yml `*-paths` keys and dbt's defaults for them
+DBT_PATH_DEFAULTS = {
+    "model-paths": ["models"],
+    "macro-paths": ["macros"],
+    "seed-paths": ["seeds"],
+    "snapshot-paths": ["snapshots"],
+    "analysis-paths": ["analyses"],
+    "test-paths": ["tests"],
+}
+
 dbt_project = DbtProject(
     project_dir=Path(__file__).joinpath("..", "..", "..", "dbt_trino").resolve(),
 )
-dbt_project.prepare_if_dev()
+
+
+def _dbt_source_dirs(project: DbtProject) -> list[Path]:
+    """Source directories declared in dbt_project.yml, falling back to dbt's defaults."""
+    config = yaml.safe_load(project.project_dir.joinpath("dbt_project.yml").read_text()) or {}
+    return [
+        project.project_dir.joinpath(path)
+        for key, default in DBT_PATH_DEFAULTS.items()
+        for path in config.get(key, default)
+    ]
+
+
+def _manifest_is_stale(project: DbtProject) -> bool:
+    """True if manifest.json is missing or older than any dbt project file."""
+    if not project.manifest_path.exists():
+        return True
+    built_at = project.manifest_path.stat().st_mtime
+    project_files = [*project.project_dir.glob("*.yml")]
+    for source_dir in _dbt_source_dirs(project):
+        project_files.extend(p for p in source_dir.rglob("*") if p.is_file())
+    return any(p.stat().st_mtime > built_at for p in project_files)
+
+
+# `dagster dev` re-parses the dbt project every time this module is imported
+# (webserver, daemon and each run worker). The manifest on disk doubles as the
+# cache, so only re-parse when the dbt project has changed since it was written.
+if _manifest_is_stale(dbt_project):
+    dbt_project.prepare_if_dev()
 
 
 @dbt_assets(manifest=dbt_project.manifest_path)
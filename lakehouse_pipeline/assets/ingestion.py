@@ -1,31 +1,61 @@
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
 import pyarrow.parquet as pq
 from pathlib import Path
 
 from dagster import asset, AssetExecutionContext, Output, MetadataValue
 
+from lakehouse_pipeline.resources.minio_resource import MinioResource
 from lakehouse_pipeline.resources.trino_resource import TrinoResource
 
 
 TAXI_BASE_URL = "https://d37ci6vzurychx.cloudfront.net/trip-data"
 DATA_DIR = Path(__file__).parent.parent.parent / "data"
+RAW_DATA_PREFIX = "raw_data/yellow_trips"
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+DOWNLOAD_PARTS = 4
 SAMPLE_SIZE = 10_000
-BATCH_SIZE = 500
 
 
-def _format_value(val):
-    if val is None or (isinstance(val, float) and str(val) == "nan"):
-        return "NULL"
-    if isinstance(val, str):
-        return f"'{val}'"
-    if hasattr(val, "isoformat"):
-        return f"TIMESTAMP '{val}'"
-    return str(val)
+def _download_range(url: str, path: Path, start: int, end: int) -> None:
+    """Fetch bytes [start, end] of url into the same offsets of a pre-sized file."""
+    headers = {"Range": f"bytes={start}-{end}", "Accept-Encoding": "identity"}
+    with requests.get(url, headers=headers, stream=True) as resp:
+        resp.raise_for_status()
+        if resp.status_code != 206:
+            raise RuntimeError(f"Server ignored the Range request for {url}")
+        with open(path, "r+b") as f:
+            f.seek(start)
+            shutil.copyfileobj(resp.raw, f, length=DOWNLOAD_CHUNK_SIZE)
+
+
+def _download(url: str, path: Path) -> None:
+    """Download url to path over DOWNLOAD_PARTS parallel Range requests when supported."""
+    head = requests.head(url, headers={"Accept-Encoding": "identity"}, allow_redirects=True)
+    head.raise_for_status()
+    size = int(head.headers.get("Content-Length", 0))
+
+    if head.headers.get("Accept-Ranges") != "bytes" or size < DOWNLOAD_PARTS:
+        with requests.get(url, stream=True) as resp:
+            resp.raise_for_status()
+            resp.raw.decode_content = True
+            with open(path, "wb") as f:
+                shutil.copyfileobj(resp.raw, f, length=DOWNLOAD_CHUNK_SIZE)
+        return
+
+    with open(path, "wb") as f:
+        f.truncate(size)
+    part_size = -(-size // DOWNLOAD_PARTS)
+    ranges = [(start, min(start + part_size, size) - 1) for start in range(0, size, part_size)]
+    with ThreadPoolExecutor(max_workers=DOWNLOAD_PARTS) as executor:
+        list(executor.map(lambda r: _download_range(url, path, *r), ranges))
 
 
 @asset(group_name="setup")
 def iceberg_schemas(trino_resource: TrinoResource) -> Output[None]:
-    """Create Iceberg schemas and the raw yellow_trips table."""
+    """Create Iceberg schemas, the raw yellow_trips table and its hive.staging source table."""
     statements = [
         "CREATE SCHEMA IF NOT EXISTS iceberg.raw",
         "CREATE SCHEMA IF NOT EXISTS iceberg.silver",
@@ -53,11 +83,40 @@ def iceberg_schemas(trino_resource: TrinoResource) -> Output[None]:
             airport_fee            DOUBLE
         ) WITH (format = 'PARQUET')
         """,
+        # External table over the raw parquet files uploaded to MinIO, so the
+        # Iceberg load is a single set-oriented INSERT ... SELECT inside Trino
+        "CREATE SCHEMA IF NOT EXISTS hive.staging",
+        f"""
+        CREATE TABLE IF NOT EXISTS hive.staging.yellow_trips (
+            vendorid               INTEGER,
+            tpep_pickup_datetime   TIMESTAMP(6),
+            tpep_dropoff_datetime  TIMESTAMP(6),
+            passenger_count        BIGINT,
+            trip_distance          DOUBLE,
+            ratecodeid             BIGINT,
+            store_and_fwd_flag     VARCHAR,
+            pulocationid           INTEGER,
+            dolocationid           INTEGER,
+            payment_type           BIGINT,
+            fare_amount            DOUBLE,
+            extra                  DOUBLE,
+            mta_tax                DOUBLE,
+            tip_amount             DOUBLE,
+            tolls_amount           DOUBLE,
+            improvement_surcharge  DOUBLE,
+            total_amount           DOUBLE,
+            congestion_surcharge   DOUBLE,
+            airport_fee            DOUBLE
+        ) WITH (
+            external_location = 's3://warehouse/{RAW_DATA_PREFIX}/',
+            format = 'PARQUET'
+        )
+        """,
     ]
     for stmt in statements:
         trino_resource.execute(stmt)
 
-    return Output(None, metadata={"status": MetadataValue.text("schemas + table created")})
+    return Output(None, metadata={"status": MetadataValue.text("schemas + tables created")})
 
 
 @asset(group_name="ingestion")
@@ -70,13 +129,18 @@ def raw_taxi_file(context: AssetExecutionContext) -> Output[str]:
     if not local_path.exists():
         url = f"{TAXI_BASE_URL}/{filename}"
         context.log.info(f"Downloading {url}")
-        resp = requests.get(url, stream=True)
-        resp.raise_for_status()
-        with open(local_path, "wb") as f:
-            for chunk in resp.iter_content(chunk_size=8192):
-                f.write(chunk)
-
-    num_rows = pq.ParquetFile(local_path).metadata.num_rows
+        # Download next to the target and rename, so a failed download never
+        # leaves a partial file that the exists() check above would accept
+        part_path = local_path.with_name(f"{filename}.part")
+        try:
+            _download(url, part_path)
+        except Exception:
+            part_path.unlink(missing_ok=True)
+            raise
+        part_path.replace(local_path)
+
+    # Footer only; nothing downstream re-opens the file in Python (Trino reads it)
+    num_rows = pq.read_metadata(local_path).num_rows
     context.log.info(f"File ready: {filename} ({num_rows:,} rows)")
 
     return Output(
@@ -88,38 +152,60 @@ def raw_taxi_file(context: AssetExecutionContext) -> Output[str]:
     )
 
 
-@asset(group_name="ingestion", deps=[iceberg_schemas])
-def iceberg_raw_yellow_trips(
+@asset(group_name="ingestion")
+def minio_taxi_file(
     context: AssetExecutionContext,
     raw_taxi_file: str,
-    trino_resource: TrinoResource,
-) -> Output[None]:
-    """Read parquet and batch-insert into Iceberg via Trino."""
-    table = pq.read_table(raw_taxi_file)
-    table = table.slice(0, SAMPLE_SIZE)
-    df = table.to_pandas()
-    df.columns = [c.lower() for c in df.columns]
-
-    conn = trino_resource.get_connection(schema="raw")
-    cursor = conn.cursor()
-
-    columns = ", ".join(df.columns)
-    total = 0
-
-    for start in range(0, len(df), BATCH_SIZE):
-        batch = df.iloc[start : start + BATCH_SIZE]
-        rows = []
-        for _, row in batch.iterrows():
-            vals = ", ".join(_format_value(v) for v in row.values)
-            rows.append(f"({vals})")
-        cursor.execute(f"INSERT INTO yellow_trips ({columns}) VALUES {', '.join(rows)}")
-        cursor.fetchall()
-        total += len(batch)
-        context.log.info(f"Inserted {total:,} / {len(df):,}")
+    minio_resource: MinioResource,
+) -> Output[str]:
+    """Upload the taxi parquet to MinIO, under the hive.staging.yellow_trips location."""
+    key = f"{RAW_DATA_PREFIX}/{Path(raw_taxi_file).name}"
+
+    if minio_resource.object_exists(key):
+        uri = f"s3://{minio_resource.bucket}/{key}"
+    else:
+        context.log.info(f"Uploading {raw_taxi_file} to {key}")
+        uri = minio_resource.upload_file(raw_taxi_file, key)
+
+    return Output(uri, metadata={"uri": MetadataValue.text(uri)})
+
+
+@asset(group_name="ingestion", deps=[iceberg_schemas, minio_taxi_file])
+def iceberg_raw_yellow_trips(trino_resource: TrinoResource) -> Output[None]:
+    """Load a sample of the raw parquet into Iceberg with one INSERT ... SELECT."""
+    result = trino_resource.execute(
+        f"""
+        INSERT INTO iceberg.raw.yellow_trips
+        SELECT
+            vendorid,
+            tpep_pickup_datetime,
+            tpep_dropoff_datetime,
+            CAST(passenger_count AS DOUBLE),
+            trip_distance,
+            CAST(ratecodeid AS DOUBLE),
+            store_and_fwd_flag,
+            pulocationid,
+            dolocationid,
+            CAST(payment_type AS INTEGER),
+            fare_amount,
+            extra,
+            mta_tax,
+            tip_amount,
+            tolls_amount,
+            improvement_surcharge,
+            total_amount,
+            congestion_surcharge,
+            airport_fee
+        FROM hive.staging.yellow_trips
+        LIMIT {SAMPLE_SIZE}
+        """
+    )
+    total = result[0][0]
 
     # Get snapshot count
-    cursor.execute('SELECT COUNT(*) FROM iceberg.raw."yellow_trips$snapshots"')
-    snap_count = cursor.fetchone()[0]
+    snap_count = trino_resource.execute(
+        'SELECT COUNT(*) FROM iceberg.raw."yellow_trips$snapshots"'
+    )[0][0]
 
     return Output(
         None,
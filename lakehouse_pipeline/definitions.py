@@ -4,9 +4,11 @@ from dagster_dbt import DbtCliResource
 from lakehouse_pipeline.assets.ingestion import (
     iceberg_schemas,
     raw_taxi_file,
+    minio_taxi_file,
     iceberg_raw_yellow_trips,
 )
 from lakehouse_pipeline.assets.dbt_assets import lakehouse_dbt_assets, dbt_project
+from lakehouse_pipeline.resources.minio_resource import MinioResource
 from lakehouse_pipeline.resources.trino_resource import TrinoResource
 
 
@@ -22,12 +24,14 @@ defs = Definitions(
     assets=[
         iceberg_schemas,
         raw_taxi_file,
+        minio_taxi_file,
         iceberg_raw_yellow_trips,
         lakehouse_dbt_assets,
     ],
     jobs=[lakehouse_full_pipeline],
     resources={
         "trino_resource": TrinoResource(),
+        "minio_resource": MinioResource(),
         "dbt": DbtCliResource(
             project_dir=str(dbt_project.project_dir),
             profiles_dir=str(dbt_project.project_dir),
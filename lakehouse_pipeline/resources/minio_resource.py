@@ -0,0 +1,31 @@
+import boto3
+from botocore.exceptions import ClientError
+from dagster import ConfigurableResource
+
+
+class MinioResource(ConfigurableResource):
+    endpoint_url: str = "http://localhost:9000"
+    access_key: str = "admin"
+    secret_key: str = "password"
+    region: str = "us-east-1"
+    bucket: str = "warehouse"
+
+    def get_client(self):
+        return boto3.client(
+            "s3",
+            endpoint_url=self.endpoint_url,
+            aws_access_key_id=self.access_key,
+            aws_secret_access_key=self.secret_key,
+            region_name=self.region,
+        )
+
+    def object_exists(self, key: str) -> bool:
+        try:
+            self.get_client().head_object(Bucket=self.bucket, Key=key)
+        except ClientError:
+            return False
+        return True
+
+    def upload_file(self, local_path: str, key: str) -> str:
+        self.get_client().upload_file(local_path, self.bucket, key)
+        return f"s3://{self.bucket}/{key}"
@@ -1,5 +1,8 @@
+import threading
+
 import trino
-from dagster import ConfigurableResource
+from dagster import ConfigurableResource, InitResourceContext
+from pydantic import PrivateAttr
 
 
 class TrinoResource(ConfigurableResource):
@@ -9,14 +12,31 @@ class TrinoResource(ConfigurableResource):
     catalog: str = "iceberg"
     schema: str = "raw"
 
+    # Open connections keyed by (thread id, schema), reused across statements
+    _connections: dict = PrivateAttr(default_factory=dict)
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    def setup_for_execution(self, context: InitResourceContext) -> None:
+        self._connections = {}
+
+    def teardown_after_execution(self, context: InitResourceContext) -> None:
+        with self._lock:
+            for conn in self._connections.values():
+                conn.close()
+            self._connections.clear()
+
     def get_connection(self, schema: str | None = None):
-        return trino.dbapi.connect(
-            host=self.host,
-            port=self.port,
-            user=self.user,
-            catalog=self.catalog,
-            schema=schema or self.schema,
-        )
+        key = (threading.get_ident(), schema or self.schema)
+        with self._lock:
+            if key not in self._connections:
+                self._connections[key] = trino.dbapi.connect(
+                    host=self.host,
+                    port=self.port,
+                    user=self.user,
+                    catalog=self.catalog,
+                    schema=key[1],
+                )
+            return self._connections[key]
 
     def execute(self, sql: str, schema: str | None = None) -> list:
         conn = self.get_connection(schema)
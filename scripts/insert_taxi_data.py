@@ -3,14 +3,20 @@ Insert NYC taxi data into Iceberg via Trino.
 
 This script:
 1. Reads a parquet file with PyArrow
-2. Samples N rows (to keep it fast)
-3. Inserts them into iceberg.raw.yellow_trips via Trino's Python client
+2. Streams just the first N rows (to keep it fast)
+3. Renders them as SQL literals column-by-column with pyarrow.compute
+4. Inserts them into iceberg.raw.yellow_trips via Trino's Python client,
+   as a single INSERT statement (see docker/trino/config.properties)
 
-Each time you run this script, Iceberg creates a NEW snapshot.
+Each time you run this script, Iceberg creates exactly one NEW snapshot.
 Run it multiple times to see snapshots accumulate.
 """
 
 import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pyarrow as pa
+import pyarrow.compute as pc
 import pyarrow.parquet as pq
 import trino
 
@@ -20,33 +26,114 @@ TRINO_HOST = "localhost"
 TRINO_PORT = 8085
 PARQUET_FILE = "data/yellow_tripdata_2024-01.parquet"
 SAMPLE_SIZE = 10_000  # rows to insert per run
-BATCH_SIZE = 500      # rows per INSERT statement
-
-
-def format_value(val):
-    """Convert a Python value to a Trino SQL literal."""
-    if val is None or (isinstance(val, float) and str(val) == "nan"):
-        return "NULL"
-    if isinstance(val, str):
-        return f"'{val}'"
-    if hasattr(val, "isoformat"):  # datetime/timestamp
-        return f"TIMESTAMP '{val}'"
-    return str(val)
+BATCH_SIZE = 5_000    # rows per record batch streamed from the parquet file
+
+# Parquet columns to read, in iceberg.raw.yellow_trips column order
+EXPECTED_COLUMNS = [
+    "VendorID",
+    "tpep_pickup_datetime",
+    "tpep_dropoff_datetime",
+    "passenger_count",
+    "trip_distance",
+    "RatecodeID",
+    "store_and_fwd_flag",
+    "PULocationID",
+    "DOLocationID",
+    "payment_type",
+    "fare_amount",
+    "extra",
+    "mta_tax",
+    "tip_amount",
+    "tolls_amount",
+    "improvement_surcharge",
+    "total_amount",
+    "congestion_surcharge",
+    "Airport_fee",
+]
+
+
+def plain_literals(column):
+    """Numbers: their string form, NULL for nulls and non-finite floats."""
+    if pa.types.is_floating(column.type):
+        # NaN/inf would render as bare nan/inf, which Trino can't parse.
+        column = pc.if_else(pc.is_finite(column), column, None)
+    return pc.cast(column, pa.string()).fill_null("NULL")
+
+
+def timestamp_literals(column):
+    """Timestamps: TIMESTAMP '...' literals, NULL for nulls."""
+    text = pc.cast(column, pa.string())
+    return pc.binary_join_element_wise("TIMESTAMP '", text, "'", "").fill_null("NULL")
+
+
+def string_literals(column):
+    """Strings: quoted, with embedded quotes escaped, NULL for nulls."""
+    text = pc.replace_substring(pc.cast(column, pa.string()), "'", "''")
+    return pc.binary_join_element_wise("'", text, "'", "").fill_null("NULL")
+
+
+def literal_formatter(arrow_type):
+    """Pick the (vectorized) SQL literal formatter for an Arrow column type."""
+    if pa.types.is_timestamp(arrow_type):
+        return timestamp_literals
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+        return string_literals
+    return plain_literals
+
+
+def sql_values(table, formatters):
+    """Convert an Arrow table to a '(v1,v2,...),(...)' VALUES clause."""
+    literals = (fmt(col) for fmt, col in zip(formatters, table.columns))
+    rows = pc.binary_join_element_wise(*literals, ",")
+    # One terminal join instead of a temporary string per row
+    return "(" + "),(".join(rows.to_pylist()) + ")"
+
+
+def read_sample(path, metadata, num_rows):
+    """Read the first num_rows rows of a parquet file, projected to EXPECTED_COLUMNS."""
+    # Only the leading row groups that hold the sample are read at all
+    row_groups = []
+    covered = 0
+    while covered < num_rows and len(row_groups) < metadata.num_row_groups:
+        covered += metadata.row_group(len(row_groups)).num_rows
+        row_groups.append(len(row_groups))
+
+    def open_reader():
+        # Reuse the already-parsed footer instead of reading it again
+        return pq.ParquetFile(path, metadata=metadata, pre_buffer=True)
+
+    if len(row_groups) <= 1:
+        # The sample is a prefix of one row group: stream just the batches it needs
+        batches = []
+        remaining = num_rows
+        for batch in open_reader().iter_batches(batch_size=BATCH_SIZE, columns=EXPECTED_COLUMNS):
+            batches.append(batch.slice(0, remaining))
+            remaining -= batches[-1].num_rows
+            if remaining <= 0:
+                break
+        return pa.Table.from_batches(batches)
+
+    # The sample spans row groups: decode them in parallel, one reader per thread
+    def read_row_group(i):
+        return open_reader().read_row_group(i, columns=EXPECTED_COLUMNS)
+
+    with ThreadPoolExecutor() as executor:
+        tables = list(executor.map(read_row_group, row_groups))
+    return pa.concat_tables(tables).slice(0, num_rows)
 
 
 def main():
     # 1. Read parquet and sample
     print(f"Reading {PARQUET_FILE}...")
-    table = pq.read_table(PARQUET_FILE)
-    print(f"  Total rows in file: {table.num_rows:,}")
+    metadata = pq.read_metadata(PARQUET_FILE)
+    print(f"  Total rows in file: {metadata.num_rows:,}")
 
-    table = table.slice(0, SAMPLE_SIZE)
-    df = table.to_pandas()
+    table = read_sample(PARQUET_FILE, metadata, SAMPLE_SIZE)
 
     # Fix column name: source has 'Airport_fee', our table has 'airport_fee'
-    df.columns = [c.lower() for c in df.columns]
+    table = table.rename_columns([c.lower() for c in table.column_names])
 
-    print(f"  Sampled {len(df):,} rows")
+    print(f"  Sampled {table.num_rows:,} rows")
 
     # 2. Connect to Trino
     print(f"Connecting to Trino at {TRINO_HOST}:{TRINO_PORT}...")
@@ -59,27 +146,21 @@ def main():
     )
     cursor = conn.cursor()
 
-    # 3. Batch insert
-    columns = ", ".join(df.columns)
-    total_inserted = 0
-
-    print(f"Inserting {len(df):,} rows in batches of {BATCH_SIZE}...")
-    for start in range(0, len(df), BATCH_SIZE):
-        batch = df.iloc[start : start + BATCH_SIZE]
-
-        rows = []
-        for _, row in batch.iterrows():
-            vals = ", ".join(format_value(v) for v in row.values)
-            rows.append(f"({vals})")
-
-        sql = f"INSERT INTO yellow_trips ({columns}) VALUES {', '.join(rows)}"
-        cursor.execute(sql)
-        cursor.fetchall()  # consume result
-
-        total_inserted += len(batch)
-        print(f"  Inserted {total_inserted:,} / {len(df):,} rows", end="\r")
-
-    print(f"\nDone! Inserted {total_inserted:,} rows.")
+    # 3. Insert the whole sample in ONE statement, so each run is one snapshot.
+    # Trino's Iceberg connector only writes in autocommit mode, so wrapping several
+    # INSERTs in a transaction would still commit one snapshot per INSERT.
+    columns = ", ".join(table.column_names)
+    formatters = [literal_formatter(t) for t in table.schema.types]  # resolved once per column
+    values = sql_values(table, formatters)
+
+    print(f"Inserting {table.num_rows:,} rows in one INSERT ({len(values):,} chars of SQL)...")
+    cursor.execute(f"INSERT INTO yellow_trips ({columns}) VALUES {values}")
+    # fetchall() reads the INSERT's row count and also acknowledges the final
+    # result page; the locked trino client (0.336) needs that last nextUri
+    # poll for the query to reach FINISHED.
+    total_inserted = cursor.fetchall()[0][0]
+
+    print(f"Done! Inserted {total_inserted:,} rows.")
 
     # 4. Verify
     cursor.execute("SELECT COUNT(*) FROM yellow_trips")